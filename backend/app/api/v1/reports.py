@@ -1,28 +1,144 @@
 """Report upload and retrieval endpoints."""
 
+import asyncio
 import hashlib
-from pathlib import Path
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 
-from app.models.schemas import ReportCreate, ReportResult
+from app.models.schemas import (
+    ObligationRow,
+    PendingFormItem,
+    PredictedQuery,
+    ReportCreate,
+    ReportResult,
+    RuleDecision,
+    SalaryRow,
+)
 from app.services.document_intelligence import (
     build_confidence_summary,
-    classify_document_type,
+    classify_document_types,
     detect_missing_documents,
     detect_pending_forms,
     extract_structured_data,
     predict_credit_queries,
+    read_document_text,
 )
 from app.services.pdf_generator import generate_report_pdf
 from app.services.report_store import generate_report_id, get_report, save_report
-from app.services.rule_engine import evaluate_eligibility
+from app.services.rule_engine import evaluate_eligibility, rules_version
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
-ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif"}
+ALLOWED_EXTENSIONS = frozenset({".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif"})
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+MAX_TOTAL_SIZE = 50 * 1024 * 1024  # 50 MB across all files
+MAX_FILES = 10
+READ_CHUNK_SIZE = 64 * 1024
+FILE_TYPE_ERROR = f"File type not allowed. Accepted: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
+# Hashes only serve ingest metadata and duplicate detection, so a fast non-NIST digest is fine.
+CONTENT_HASH_ALGORITHM = "blake2b-256"
+DEDUP_TTL_SECONDS = 60 * 60
+DEDUP_MAX_ENTRIES = 1024
+PDF_CACHE_SIZE = 256
+PDF_CONTENT_DISPOSITION = 'attachment; filename="eligibility-report-{}.pdf"'
+
+# Content key -> (expiry, report_id) for short-circuiting repeat submissions.
+_dedup_cache: dict[str, tuple[float, str]] = {}
+# Lookups run in worker threads and inserts on the event loop; dict updates and eviction hold this lock.
+_dedup_lock = threading.Lock()
+
+
+def _dedup_key(filenames: list[str], doc_hashes: list[str], user_id: str | None, category: str | None) -> str:
+    # Filenames drive document classification, so they are part of the key.
+    parts = sorted(f"{name}:{digest}" for name, digest in zip(filenames, doc_hashes))
+    parts.append(f"user={user_id or ''}")
+    parts.append(f"category={category or ''}")
+    # Reports reflect the rules they were evaluated with; a rules reload must not return stale ones.
+    parts.append(f"rules={rules_version().hex()}")
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=32).hexdigest()
+
+
+def _lookup_duplicate(key: str) -> dict | None:
+    entry = _dedup_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, report_id = entry
+    report = get_report(report_id) if expires_at > time.monotonic() else None
+    if report is None:
+        with _dedup_lock:
+            _dedup_cache.pop(key, None)
+    return report
+
+
+def _remember_report(key: str, report_id: str) -> None:
+    with _dedup_lock:
+        if len(_dedup_cache) >= DEDUP_MAX_ENTRIES:
+            _dedup_cache.pop(next(iter(_dedup_cache)))
+        _dedup_cache[key] = (time.monotonic() + DEDUP_TTL_SECONDS, report_id)
+
+
+def _read_and_hash(upload: UploadFile) -> tuple[bytes, str]:
+    """
+    Read an upload in fixed-size chunks, hashing each chunk as it arrives.
+    Oversized files are rejected as soon as the limit is crossed.
+    """
+    # The multipart parser records the spooled size; skip reading when it is already too big.
+    if upload.size is not None and upload.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail=f"{upload.filename} exceeds 10 MB size limit")
+
+    hasher = hashlib.blake2b(digest_size=32)
+    buf = BytesIO()
+    size = 0
+    while chunk := upload.file.read(READ_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_FILE_SIZE:
+            raise HTTPException(status_code=400, detail=f"{upload.filename} exceeds 10 MB size limit")
+        hasher.update(chunk)
+        buf.write(chunk)
+    return buf.getvalue(), hasher.hexdigest()
+
+
+def _split_upload_name(filename: str) -> tuple[str, str]:
+    """Return the basename without client directories and its lowercased suffix."""
+    safe_name = filename.replace("\\", "/").rpartition("/")[2]
+    dot = safe_name.rfind(".")
+    return safe_name, safe_name[dot:].lower() if dot > 0 else ""
+
+
+async def _ingest(upload: UploadFile) -> tuple[str, bytes, str]:
+    """Validate a single upload and return its safe name, bytes and digest."""
+    if not upload.filename:
+        raise HTTPException(status_code=400, detail="Filename is required")
+    safe_name, suffix = _split_upload_name(upload.filename)
+    if suffix not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=FILE_TYPE_ERROR)
+
+    # Blocking reads and hashing run in a worker thread to keep the event loop free.
+    content, digest = await asyncio.to_thread(_read_and_hash, upload)
+    return safe_name, content, digest
+
+
+@lru_cache(maxsize=PDF_CACHE_SIZE)
+def _render_pdf(report_id: str) -> bytes:
+    # Reports are immutable once saved, so the rendered PDF can be reused per report_id.
+    report = get_report(report_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return generate_report_pdf(report)
+
+
+async def _iter_chunks(data: bytes, chunk_size: int = READ_CHUNK_SIZE):
+    # Slices of a memoryview share the cached PDF buffer instead of copying it.
+    # An async generator avoids a threadpool hop per chunk for in-memory data.
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
 
 
 @router.post("/upload", response_model=ReportCreate)
@@ -36,35 +152,43 @@ async def upload_report(
     """
     if not files:
         raise HTTPException(status_code=400, detail="At least one document is required")
+    if len(files) > MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files. Maximum is {MAX_FILES} per upload")
+    # Spooled sizes are known up front, so oversized batches are rejected before any read or hash.
+    if sum(upload.size or 0 for upload in files) > MAX_TOTAL_SIZE:
+        raise HTTPException(status_code=400, detail="Combined upload exceeds 50 MB size limit")
 
-    filenames: list[str] = []
-    documents: list[dict] = []
-    doc_hashes: list[str] = []
-    total_size = 0
-    for upload in files:
-        if not upload.filename:
-            raise HTTPException(status_code=400, detail="Filename is required")
-        suffix = Path(upload.filename).suffix.lower()
-        if suffix not in ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type not allowed. Accepted: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
-            )
-
-        content = await upload.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=f"{upload.filename} exceeds 10 MB size limit")
-        total_size += len(content)
-        safe_name = Path(upload.filename).name
-        filenames.append(safe_name)
-        documents.append({"filename": safe_name, "content": content})
-        doc_hashes.append(hashlib.sha256(content).hexdigest())
+    # Files are independent, so read and hash them concurrently.
+    ingested = await asyncio.gather(*(_ingest(upload) for upload in files))
+    filenames = [name for name, _, _ in ingested]
+    documents = [{"filename": name, "content": content} for name, content, _ in ingested]
+    doc_hashes = [digest for _, _, digest in ingested]
+    total_size = sum(len(content) for _, content, _ in ingested)
+    if total_size > MAX_TOTAL_SIZE:
+        raise HTTPException(status_code=400, detail="Combined upload exceeds 50 MB size limit")
 
-    extracted_data, salary_breakdown, obligations, processing = extract_structured_data(documents)
+    dedup_key = _dedup_key(filenames, doc_hashes, user_id, category)
+    previous = await asyncio.to_thread(_lookup_duplicate, dedup_key)
+    if previous:
+        return ReportCreate(report_id=previous["report_id"], eligibility=previous["eligibility"])
+
+    # Text extraction/OCR is per file, so run each document in its own worker thread.
+    # PDFium calls are serialized inside document_intelligence; Tesseract OCR is what overlaps.
+    texts = await asyncio.gather(
+        *(asyncio.to_thread(read_document_text, doc["filename"], doc["content"]) for doc in documents)
+    )
+    for doc, (text, info) in zip(documents, texts):
+        doc["text"] = text
+        doc["text_info"] = info
+
+    # Parsing and the SQLite write are blocking, so keep them off the event loop.
+    extracted_data, salary_breakdown, obligations, processing = await asyncio.to_thread(
+        extract_structured_data, documents
+    )
     if processing.get("low_quality"):
         raise HTTPException(status_code=422, detail="Document quality is low. Please upload a clearer scan.")
 
-    doc_types = [classify_document_type(name) for name in filenames]
+    doc_types = classify_document_types(filenames)
     missing_documents = detect_missing_documents(doc_types)
     pending_forms = detect_pending_forms(extracted_data, missing_documents)
     predicted_queries = predict_credit_queries(extracted_data, missing_documents, pending_forms)
@@ -83,11 +207,13 @@ async def upload_report(
         "uploaded_files": filenames,
         "uploaded_count": len(filenames),
         "total_size_bytes": total_size,
-        "sha256": doc_hashes,
+        "content_hash": doc_hashes,
+        "hash_algorithm": CONTENT_HASH_ALGORITHM,
     }
     metadata["processing"] = processing
 
-    save_report(
+    await asyncio.to_thread(
+        save_report,
         report_id=report_id,
         eligibility=eligible,
         decisions=decisions,
@@ -100,6 +226,7 @@ async def upload_report(
         confidence_summary=confidence_summary,
         metadata=metadata,
     )
+    _remember_report(dedup_key, report_id)
 
     return ReportCreate(
         report_id=report_id,
@@ -111,22 +238,25 @@ async def upload_report(
 @router.get("/{report_id}", response_model=ReportResult)
 async def get_report_result(report_id: str):
     """Retrieve eligibility result for a report."""
-    report = get_report(report_id)
+    # The store serializes access to its shared connection, so never wait on it from the event loop.
+    report = await asyncio.to_thread(get_report, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return ReportResult(
+    get = report.get
+    # Stored payloads were produced from validated models by save_report, so skip re-validation.
+    return ReportResult.model_construct(
         report_id=report["report_id"],
-        created_at=report["created_at"],
+        created_at=datetime.fromisoformat(report["created_at"]),
         eligibility=report["eligibility"],
-        decisions=report["decisions"],
+        decisions=[RuleDecision.model_construct(**d) for d in report["decisions"]],
         extracted_data=report["extracted_data"],
-        salary_breakdown=report.get("salary_breakdown", []),
-        obligations=report.get("obligations", []),
-        missing_documents=report.get("missing_documents", []),
-        pending_forms=report.get("pending_forms", []),
-        predicted_queries=report.get("predicted_queries", []),
-        confidence_summary=report.get("confidence_summary", {}),
+        salary_breakdown=[SalaryRow.model_construct(**row) for row in get("salary_breakdown", [])],
+        obligations=[ObligationRow.model_construct(**row) for row in get("obligations", [])],
+        missing_documents=get("missing_documents", []),
+        pending_forms=[PendingFormItem.model_construct(**item) for item in get("pending_forms", [])],
+        predicted_queries=[PredictedQuery.model_construct(**q) for q in get("predicted_queries", [])],
+        confidence_summary=get("confidence_summary", {}),
         metadata=report["metadata"],
         pdf_available=True,
     )
@@ -135,15 +265,12 @@ async def get_report_result(report_id: str):
 @router.get("/{report_id}/pdf")
 async def download_report_pdf(report_id: str):
     """Download the generated report as PDF."""
-    report = get_report(report_id)
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
-
-    pdf_bytes = generate_report_pdf(report)
-    return Response(
-        content=pdf_bytes,
+    pdf_bytes = await asyncio.to_thread(_render_pdf, report_id)
+    return StreamingResponse(
+        _iter_chunks(pdf_bytes),
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f'attachment; filename="eligibility-report-{report_id}.pdf"'
+            "Content-Disposition": PDF_CONTENT_DISPOSITION.format(report_id),
+            "Content-Length": str(len(pdf_bytes)),
         },
     )
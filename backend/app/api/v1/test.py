@@ -1,11 +1,17 @@
 """Test endpoint for frontend-backend connectivity."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
 router = APIRouter()
 
+_TEST_RESPONSE = {
+    "status": "ok",
+    "message": "Frontend successfully connected to FastAPI backend",
+    "version": "0.1.0",
+}
+
 
 @router.get("/test")
 async def test_connection():
@@ -13,9 +19,4 @@ async def test_connection():
     Test endpoint to verify frontend-backend connection.
     Called by the React app to confirm the API is reachable.
     """
-    return {
-        "status": "ok",
-        "message": "Frontend successfully connected to FastAPI backend",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "version": "0.1.0",
-    }
+    return _TEST_RESPONSE | {"timestamp": datetime.now(timezone.utc)}
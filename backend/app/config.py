@@ -1,51 +1,73 @@
 """Application configuration."""
 
-from functools import lru_cache
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import List
 
-from pydantic_settings import BaseSettings
+ENV_FILE = Path(".env")
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
 
 
-class Settings(BaseSettings):
+def _read_env_file(path: Path) -> dict[str, str]:
+    """Parse KEY=VALUE lines from a .env file. A missing file yields no values."""
+    values: dict[str, str] = {}
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return values
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        values[key.strip().upper()] = value.strip().strip("'\"")
+    return values
+
+
+def _load_environment() -> dict[str, str]:
+    # Real environment variables win over .env entries; keys are case-insensitive.
+    env = _read_env_file(ENV_FILE)
+    env.update((key.upper(), value) for key, value in os.environ.items())
+    return env
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Application settings loaded from environment."""
 
     app_name: str = "Eligibility Report API"
     debug: bool = False
 
-    # CORS - allow Vite dev server on any port (5173-5180)
+    # CORS - allow Vite dev server on any port (5173-5180) and port 3000
     # Include 127.0.0.1 variants - Windows may use different origin
-    # Allow all origins in dev if needed (set CORS_ORIGINS=* in .env)
-    cors_origins: List[str] = [
-        "http://localhost:5173",
-        "http://127.0.0.1:5173",
-        "http://localhost:5174",
-        "http://127.0.0.1:5174",
-        "http://localhost:5175",
-        "http://127.0.0.1:5175",
-        "http://localhost:5176",
-        "http://127.0.0.1:5176",
-        "http://localhost:5177",
-        "http://127.0.0.1:5177",
-        "http://localhost:5178",
-        "http://127.0.0.1:5178",
-        "http://localhost:5179",
-        "http://127.0.0.1:5179",
-        "http://localhost:5180",
-        "http://127.0.0.1:5180",
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-    ]
+    # Matched once per request by a single compiled regex in CORSMiddleware
+    cors_origin_regex: str = r"http://(localhost|127\.0\.0\.1):(3000|517[3-9]|5180)"
+    # Extra exact origins (e.g. a deployed frontend), comma-separated CORS_ORIGINS in .env
+    cors_origins: List[str] = field(default_factory=list)
 
     # API
     api_v1_prefix: str = "/api/v1"
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    @classmethod
+    def from_env(cls) -> "Settings":
+        env = _load_environment()
+        defaults = cls()
+        origins = env.get("CORS_ORIGINS")
+        return cls(
+            app_name=env.get("APP_NAME", defaults.app_name),
+            debug=env["DEBUG"].strip().lower() in TRUE_VALUES if "DEBUG" in env else defaults.debug,
+            cors_origin_regex=env.get("CORS_ORIGIN_REGEX", defaults.cors_origin_regex),
+            cors_origins=(
+                [o.strip() for o in origins.split(",") if o.strip()] if origins is not None else defaults.cors_origins
+            ),
+            api_v1_prefix=env.get("API_V1_PREFIX", defaults.api_v1_prefix),
+        )
+
+
+SETTINGS = Settings.from_env()
 
 
-@lru_cache
 def get_settings() -> Settings:
-    """Cached settings instance."""
-    return Settings()
+    """Settings instance loaded at import time."""
+    return SETTINGS
@@ -1,49 +1,62 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
-from app.config import get_settings
+from app.config import SETTINGS
 from app.api.v1 import router as api_v1_router
+from app.services.rule_engine import warm_rule_cache, watch_rules
+
+# Liveness probes are hit constantly; serve a pre-encoded body.
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan - startup and shutdown events."""
-    # Startup
-    yield
-    # Shutdown (cleanup if needed)
+    # Parse the eligibility rules before serving so the first upload doesn't pay for it,
+    # then pick up edits to the rules file as they happen instead of checking it per request.
+    warm_rule_cache()
+    stop_watching = asyncio.Event()
+    watcher = asyncio.create_task(watch_rules(stop_watching))
+    try:
+        yield
+    finally:
+        stop_watching.set()
+        await watcher
 
 
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application."""
-    settings = get_settings()
-
     app = FastAPI(
-        title=settings.app_name,
+        title=SETTINGS.app_name,
         description="AI-powered eligibility report generation system",
         version="0.1.0",
-        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins,
+        allow_origins=SETTINGS.cors_origins,
+        allow_origin_regex=SETTINGS.cors_origin_regex,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
 
-    app.include_router(api_v1_router, prefix=settings.api_v1_prefix)
+    app.include_router(api_v1_router, prefix=SETTINGS.api_v1_prefix)
 
     @app.get("/health")
     async def health_check():
         """Liveness probe."""
-        return {"status": "healthy"}
+        return Response(content=_HEALTH_BODY, media_type="application/json")
 
     return app
 
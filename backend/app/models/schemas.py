@@ -3,7 +3,10 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Report rows are built once and only read afterwards.
+ROW_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 
 class UploadMetadata(BaseModel):
@@ -16,6 +19,8 @@ class UploadMetadata(BaseModel):
 class RuleDecision(BaseModel):
     """Single rule evaluation result."""
 
+    model_config = ROW_MODEL_CONFIG
+
     rule_id: str
     rule_name: str
     passed: bool
@@ -24,6 +29,8 @@ class RuleDecision(BaseModel):
 
 
 class SalaryRow(BaseModel):
+    model_config = ROW_MODEL_CONFIG
+
     month: str
     employer: str
     amount: float
@@ -31,6 +38,8 @@ class SalaryRow(BaseModel):
 
 
 class ObligationRow(BaseModel):
+    model_config = ROW_MODEL_CONFIG
+
     lender: str
     obligation_type: str
     monthly_amount: float
@@ -38,12 +47,16 @@ class ObligationRow(BaseModel):
 
 
 class PendingFormItem(BaseModel):
+    model_config = ROW_MODEL_CONFIG
+
     form_code: str
     form_name: str
     reason: str
 
 
 class PredictedQuery(BaseModel):
+    model_config = ROW_MODEL_CONFIG
+
     query: str
     confidence: float = Field(ge=0, le=1)
     rationale: str
@@ -75,6 +88,8 @@ class ReportCreate(BaseModel):
 class ReportResult(BaseModel):
     """Full report result for GET /reports/{id}."""
 
+    model_config = ROW_MODEL_CONFIG
+
     report_id: str
     created_at: datetime
     eligibility: bool
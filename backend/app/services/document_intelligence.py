@@ -1,138 +1,305 @@
 """Document extraction, OCR fallback, checklist detection, and query prediction."""
 
+import heapq
 import json
+import os
 import re
 import shutil
+import threading
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
 
 from app.models.schemas import ObligationRow, PendingFormItem, PredictedQuery, SalaryRow
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 PDF_TEXT_THRESHOLD = 40
 OCR_MIN_CONFIDENCE = 0.55
+OCR_MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Text-only OCR for pages whose confidence is taken from a sampled page: LSTM engine, single text block.
+OCR_FAST_CONFIG = "--oem 1 --psm 6"
+# Render scale is 2x (144 DPI) for ordinary pages; oversized pages are shrunk so the long edge stays within this.
+OCR_RENDER_SCALE = 2.0
+OCR_MAX_RENDER_PX = 2400
+# PDFium is not thread-safe: every pypdfium2 call (open, text, render, close) must hold this lock.
+_PDFIUM_LOCK = threading.Lock()
+# One process-wide pool caps concurrent Tesseract subprocesses across all uploads and documents.
+# Only leaf OCR calls are submitted to it, so callers never block waiting on their own pool.
+_OCR_POOL = ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS, thread_name_prefix="ocr")
 MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_MONTH_NUM: dict[str, int] = {name: num for num, name in enumerate(MONTH_NAMES, start=1)}
 SALARY_TABLE_LABELS = ("salary slip", "salary summary", "salary statement")
-
-
-def _load_json(filename: str) -> dict:
+SALARY_KEYWORDS = ("monthly salary", "net salary", "net pay", "salary credited", "take home", "gross salary", "income")
+EMI_KEYWORDS = ("emi", "monthly installment", "loan emi", "total emi", "obligation")
+OUTSTANDING_KEYWORDS = ("outstanding", "principal outstanding", "loan outstanding", "total due")
+# Filename keywords per document type, in classification priority order.
+FILENAME_DOC_TYPES = (
+    ("pan_card", ("pan", "permanent account number")),
+    ("bank_statement", ("bank", "statement")),
+    ("salary_slip", ("salary", "payslip")),
+    ("id_proof", ("aadhaar", "aadhar", "id")),
+    ("itr", ("itr",)),
+)
+_MONTH_ALTERNATION = "|".join(MONTH_NAMES)
+# Optional currency prefix, then the number; only the number is captured.
+_AMOUNT_TAIL = r"(?:₹|rs\.?|inr)?\s*([0-9][0-9,]*(?:\.\d+)?)"
+# Grouping commas (and a stray rupee sign) dropped in one C-level pass; float() tolerates edge whitespace.
+_AMOUNT_TRANS = str.maketrans("", "", ",₹")
+
+# Patterns are compiled once at import; parsing runs them many times per request.
+# Field labels located by one scan of the (lowercased) text; "credit"/"cibil" start a credit-score label.
+_FIELD_KEYWORDS = SALARY_KEYWORDS + EMI_KEYWORDS + OUTSTANDING_KEYWORDS + ("credit", "cibil")
+_FIELD_KEYWORD_RE = re.compile(
+    "(?=(?:" + "|".join(re.escape(kw) for kw in sorted(_FIELD_KEYWORDS, key=len, reverse=True)) + "))"
+)
+# Anchored right after a keyword: the first number within 120 chars, optionally currency-prefixed.
+_AMOUNT_AFTER_KEYWORD_RE = re.compile(r"(?is).{0,120}?((?:₹|rs\.?|inr)\s*)?([0-9][0-9,]*(?:\.\d+)?)")
+# PAN evidence in extracted text: the keywords or a PAN-shaped identifier, in one case-insensitive scan.
+_PAN_TEXT_RE = re.compile(r"(?i)pan|permanent account number|\b[a-z]{5}[0-9]{4}[a-z]\b")
+_CREDIT_SCORE_RE = re.compile(r"(?is)(?:credit|cibil)\s*score.{0,30}?([3-9][0-9]{2})")
+_NAMED_MONTH_RE = re.compile(r"(?i)\b(" + _MONTH_ALTERNATION + r")[a-z]*[\s\-/,]*(20[0-9]{2})?\b")
+# Matches dates like 12/01/2026, 12-1-26, 2026/01/12
+_DMY_RE = re.compile(r"\b([0-3]?\d)[/\-]([0-1]?\d)[/\-]((?:20)?\d{2})\b")
+_YMD_RE = re.compile(r"\b((?:20)?\d{2})[/\-]([0-1]?\d)[/\-]([0-3]?\d)\b")
+# Transaction evidence in one scan: a d/m/y or y/m/d date, or a month name with optional year.
+# The month-name branch stays on its line and leaves a following y/m/d date for the date branches.
+_TX_MONTH_RE = re.compile(
+    r"(?i)\b(?:(?:[0-3]?\d)[/\-](?P<dmy_month>[0-1]?\d)[/\-](?P<dmy_year>(?:20)?\d{2})"
+    r"|(?P<ymd_year>(?:20)?\d{2})[/\-](?P<ymd_month>[0-1]?\d)[/\-][0-3]?\d"
+    r"|(?P<month_name>" + _MONTH_ALTERNATION + r")[a-z]*(?:[^\S\n]|[\-/,])*"
+    r"(?P<named_year>(?<=[a-z])20[0-9]{2}|20[0-9]{2}(?![/\-][0-1]?\d[/\-][0-3]?\d\b))?)\b"
+)
+_DIGIT_RE = re.compile(r"[0-9]")
+_SUMMARY_SECTION_RE = re.compile(r"(?is)bank\s*statement\s*summary(.{0,2500})")
+# Salary rows, one pattern for both layouts so each line is scanned once. The delimiter
+# branch is tried first at each position; each branch captures (year, employer, amount):
+#   delimiter-based  Jan 2026 | Acme Corp | INR 55,000  -> groups 2-4
+#   whitespace-based Jan 2026 Acme Corp INR 55,000      -> groups 5-7
+_SALARY_ROW_RE = re.compile(
+    r"(?i)\b(" + _MONTH_ALTERNATION + r")[a-z]*"
+    r"(?:\s*(20\d{2})?\s*[\|,;\t]\s*([^|,;\t]{2,80})\s*[\|,;\t]\s*" + _AMOUNT_TAIL
+    + r"|\s*(20\d{2})?\s+([A-Za-z][A-Za-z0-9&.,'()\- ]{2,80}?)\s+" + _AMOUNT_TAIL + r"\b)"
+)
+_TAG_TOKEN_RE = re.compile(r"[a-z_]+")
+
+_FILENAME_KEYWORD_PRIORITY = {
+    keyword: priority for priority, (_, keywords) in enumerate(FILENAME_DOC_TYPES) for keyword in keywords
+}
+# Zero-width lookahead reports every keyword occurrence, including overlapping ones, in one scan.
+_FILENAME_KEYWORD_RE = re.compile(
+    "(?=("
+    + "|".join(re.escape(kw) for kw in sorted(_FILENAME_KEYWORD_PRIORITY, key=len, reverse=True))
+    + "))"
+)
+
+
+@lru_cache(maxsize=16)
+def _load_json(filename: str) -> MappingProxyType:
+    # Data files are static at runtime; parse once and hand out a read-only view of the cached dict.
     with (DATA_DIR / filename).open("r", encoding="utf-8") as f:
-        return json.load(f)
+        return MappingProxyType(json.load(f))
+
 
+def classify_document_types(filenames: list[str]) -> list[str]:
+    """Classify documents by filename, scanning all names in a single regex pass."""
+    joined = "\n".join(filenames).lower()
+    starts: list[int] = []
+    offset = 0
+    for name in filenames:
+        starts.append(offset)
+        offset += len(name) + 1
 
-def _is_pan_match(text: str) -> bool:
-    return bool(re.search(r"\b[A-Z]{5}[0-9]{4}[A-Z]\b", text.upper()))
+    best: list[int | None] = [None] * len(filenames)
+    for m in _FILENAME_KEYWORD_RE.finditer(joined):
+        idx = bisect_right(starts, m.start()) - 1
+        priority = _FILENAME_KEYWORD_PRIORITY[m.group(1)]
+        if best[idx] is None or priority < best[idx]:
+            best[idx] = priority
+    return [FILENAME_DOC_TYPES[p][0] if p is not None else "other" for p in best]
 
 
 def classify_document_type(filename: str, extracted_text: str = "") -> str:
-    lower = filename.lower()
-    text_lower = extracted_text.lower()
-
-    if (
-        "pan" in lower
-        or "permanent account number" in lower
-        or "pan" in text_lower
-        or "permanent account number" in text_lower
-        or _is_pan_match(extracted_text)
-    ):
-        return "pan_card"
+    doc_type = classify_document_types([filename])[0]
+    if doc_type == "pan_card":
+        return doc_type
 
-    if "bank" in lower or "statement" in lower:
-        return "bank_statement"
-    if "salary" in lower or "payslip" in lower:
-        return "salary_slip"
-    if "aadhaar" in lower or "aadhar" in lower or "id" in lower:
-        return "id_proof"
-    if "itr" in lower:
-        return "itr"
-    return "other"
+    if _PAN_TEXT_RE.search(extracted_text):
+        return "pan_card"
+    return doc_type
 
 
 def is_tesseract_available() -> bool:
     return shutil.which("tesseract") is not None
 
 
-def _read_pdf_text(content: bytes) -> str:
+def _read_pdf_pages(content: bytes) -> list[str]:
+    """Embedded text per page; empty when the PDF cannot be parsed."""
+    try:
+        import pypdfium2 as pdfium  # type: ignore
+
+        # PDFium extracts text in C, far faster than pypdf's pure-Python parser.
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(BytesIO(content))
+            try:
+                pages: list[str] = []
+                for idx in range(len(pdf)):
+                    page = pdf.get_page(idx)
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+                    textpage.close()
+                    page.close()
+                return pages
+            finally:
+                pdf.close()
+    except Exception:
+        pass
     try:
         from pypdf import PdfReader  # type: ignore
 
         reader = PdfReader(BytesIO(content))
-        return "\n".join((page.extract_text() or "") for page in reader.pages)
+        return [(page.extract_text() or "") for page in reader.pages]
     except Exception:
-        return ""
+        return []
 
 
-def _ocr_image_bytes(content: bytes) -> tuple[str, float]:
+def _ocr_image(image) -> tuple[str, float]:
+    """OCR an already-decoded PIL image."""
     try:
         import pytesseract  # type: ignore
-        from PIL import Image  # type: ignore
 
-        image = Image.open(BytesIO(content))
         data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-        words: list[str] = []
-        conf_values: list[float] = []
-        for idx, token in enumerate(data.get("text", [])):
-            txt = (token or "").strip()
-            conf_raw = str(data.get("conf", ["-1"])[idx])
-            try:
-                conf = float(conf_raw)
-            except Exception:
-                conf = -1
-            if txt:
-                words.append(txt)
-            if conf >= 0:
-                conf_values.append(conf / 100.0)
+        words = [txt for txt in map(str.strip, filter(None, data.get("text", ()))) if txt]
         if not words:
             return "", 0.0
-        avg_conf = sum(conf_values) / len(conf_values) if conf_values else 0.0
+        # Tesseract reports -1 for non-word boxes (blocks, lines); only real word confidences count.
+        conf_values = [conf for conf in map(float, data.get("conf", ())) if conf >= 0]
+        avg_conf = sum(conf_values) / len(conf_values) / 100.0 if conf_values else 0.0
         return " ".join(words), round(avg_conf, 2)
     except Exception:
         return "", 0.0
 
 
-def _ocr_pdf_bytes(content: bytes) -> tuple[str, float]:
+def _ocr_image_text(image) -> str:
+    """Text-only OCR; image_to_string skips building the word-level TSV of image_to_data."""
+    try:
+        import pytesseract  # type: ignore
+
+        return pytesseract.image_to_string(image, config=OCR_FAST_CONFIG).strip()
+    except Exception:
+        return ""
+
+
+def _ocr_image_bytes(content: bytes) -> tuple[str, float]:
+    try:
+        from PIL import Image  # type: ignore
+
+        image = Image.open(BytesIO(content))
+    except Exception:
+        return "", 0.0
+    return _OCR_POOL.submit(_ocr_image, image).result()
+
+
+def _render_scale(page) -> float:
+    return min(OCR_RENDER_SCALE, OCR_MAX_RENDER_PX / max(page.get_size()))
+
+
+def _ocr_rendered_pages(pdf, indices: list[int], ocr) -> list:
+    """Render pages under the PDFium lock and OCR them in parallel batches with the lock released."""
+    results = []
+    for start in range(0, len(indices), OCR_MAX_WORKERS):
+        with _PDFIUM_LOCK:
+            pages = [pdf.get_page(idx) for idx in indices[start : start + OCR_MAX_WORKERS]]
+            # Greyscale rendering: Tesseract binarises anyway, and 1 byte/pixel is a third of RGB.
+            bitmaps = [page.render(scale=_render_scale(page), grayscale=True) for page in pages]
+            # Rendered bitmaps go straight to OCR; no PNG encode/decode round-trip.
+            images = [bitmap.to_pil() for bitmap in bitmaps]
+        # Tesseract runs as a subprocess, so threads give real parallelism; map keeps page order.
+        results.extend(_OCR_POOL.map(ocr, images))
+        with _PDFIUM_LOCK:
+            for bitmap, page in zip(bitmaps, pages):
+                bitmap.close()
+                page.close()
+    return results
+
+
+def _ocr_pdf_pages(content: bytes, page_indices: list[int] | None = None) -> list[tuple[str, float]]:
     """
-    Render PDF pages to images and OCR them.
+    Render PDF pages to images and OCR them, returning (text, confidence) per page.
+    Only `page_indices` are processed when given; otherwise every page.
     Uses pypdfium2 so no external poppler dependency is required.
     """
     try:
         import pypdfium2 as pdfium  # type: ignore
 
-        pdf = pdfium.PdfDocument(BytesIO(content))
-        page_texts: list[str] = []
-        conf_scores: list[float] = []
-        for idx in range(len(pdf)):
-            page = pdf.get_page(idx)
-            bitmap = page.render(scale=2.0)
-            pil_image = bitmap.to_pil()
-            buf = BytesIO()
-            pil_image.save(buf, format="PNG")
-            txt, conf = _ocr_image_bytes(buf.getvalue())
-            if txt.strip():
-                page_texts.append(txt)
-            conf_scores.append(conf)
-            page.close()
-        merged = "\n".join(page_texts)
-        avg_conf = sum(conf_scores) / len(conf_scores) if conf_scores else 0.0
-        return merged, round(avg_conf, 2)
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(BytesIO(content))
+            indices = list(range(len(pdf))) if page_indices is None else page_indices
+        results: list[tuple[str, float]] = []
+        try:
+            # Word confidences need image_to_data; sample leading pages until one yields text,
+            # then OCR the rest with the cheaper image_to_string and reuse that confidence.
+            pos = 0
+            sampled_conf: float | None = None
+            while pos < len(indices) and sampled_conf is None:
+                txt, conf = _ocr_rendered_pages(pdf, indices[pos : pos + 1], _ocr_image)[0]
+                results.append((txt, conf))
+                pos += 1
+                if txt.strip():
+                    sampled_conf = conf
+            for txt in _ocr_rendered_pages(pdf, indices[pos:], _ocr_image_text):
+                results.append((txt, sampled_conf))
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+        return results
     except Exception:
-        return "", 0.0
+        return []
 
 
-def _read_text_from_document(filename: str, content: bytes) -> tuple[str, dict]:
+def read_document_text(filename: str, content: bytes) -> tuple[str, dict]:
+    """
+    Extract text from a single document, falling back to OCR when needed.
+    Documents are independent, so callers may run this per file in parallel.
+    """
     suffix = Path(filename).suffix.lower()
     ocr_used = False
     ocr_conf = 0.0
 
     if suffix == ".pdf":
-        text = _read_pdf_text(content)
-        # Scanned PDFs often have little/no embedded text.
+        pages = _read_pdf_pages(content)
+        # Scanned pages have little/no embedded text; only those go through OCR.
+        ocr_indices = [idx for idx, txt in enumerate(pages) if len(txt.strip()) < PDF_TEXT_THRESHOLD]
+        if pages and not ocr_indices:
+            return "\n".join(pages), {"ocr_used": False, "ocr_confidence": 1.0}
+
+        if pages:
+            ocr_results = _ocr_pdf_pages(content, ocr_indices)
+        else:
+            # No readable text layer: OCR every page pdfium can render.
+            ocr_results = _ocr_pdf_pages(content)
+            pages = [""] * len(ocr_results)
+            ocr_indices = list(range(len(ocr_results)))
+        conf_scores: list[float] = []
+        for idx, (txt, conf) in zip(ocr_indices, ocr_results):
+            if txt.strip():
+                pages[idx] = txt
+                conf_scores.append(conf)
+        text = "\n".join(txt for txt in pages if txt.strip())
+        if conf_scores:
+            # Confidence reflects OCR'd pages that produced text; blank pages don't drag it down.
+            ocr_conf = round(sum(conf_scores) / len(conf_scores), 2)
+            return text, {"ocr_used": True, "ocr_confidence": ocr_conf}
         if len(text.strip()) >= PDF_TEXT_THRESHOLD:
+            # OCR added nothing, but the embedded text is enough on its own (e.g. a digital PDF with a blank page).
             return text, {"ocr_used": False, "ocr_confidence": 1.0}
-        ocr_used = True
-        text, ocr_conf = _ocr_pdf_bytes(content)
-        return text, {"ocr_used": ocr_used, "ocr_confidence": ocr_conf}
+        # Too little embedded text and nothing readable from OCR: a scan that fails the quality check.
+        return text, {"ocr_used": True, "ocr_confidence": 0.0}
 
     if suffix in {".png", ".jpg", ".jpeg", ".tif", ".tiff"}:
         ocr_used = True
@@ -143,78 +310,111 @@ def _read_text_from_document(filename: str, content: bytes) -> tuple[str, dict]:
 
 
 def _to_amount(raw: str) -> float:
-    return float(raw.replace(",", "").strip())
+    return float(raw.translate(_AMOUNT_TRANS))
+
+
+def _field_keyword_positions(text: str) -> dict[str, list[int]]:
+    """Start offsets of every field keyword in lowercased `text`, collected in a single scan."""
+    positions: dict[str, list[int]] = {}
+    for m in _FIELD_KEYWORD_RE.finditer(text):
+        pos = m.start()
+        # Several keywords can start at one offset ("loan emi" / "loan outstanding" prefixes).
+        for keyword in _FIELD_KEYWORDS:
+            if text.startswith(keyword, pos):
+                positions.setdefault(keyword, []).append(pos)
+    return positions
 
 
-def _find_amount_after_keywords(text: str, keywords: list[str]) -> float | None:
+def _find_amount_after_keywords(
+    text: str, keywords: tuple[str, ...], positions: dict[str, list[int]]
+) -> float | None:
+    # Keyword order is priority; within a keyword the earliest occurrence followed by an amount wins.
     for keyword in keywords:
-        m = re.search(
-            rf"(?is){re.escape(keyword)}.{{0,120}}?((?:₹|rs\.?|inr)\s*)?([0-9][0-9,]*(?:\.\d+)?)",
-            text,
-        )
-        if m:
-            return _to_amount(m.group(2))
+        for pos in positions.get(keyword, ()):
+            m = _AMOUNT_AFTER_KEYWORD_RE.match(text, pos + len(keyword))
+            if m:
+                return _to_amount(m.group(2))
     return None
 
 
-def _find_credit_score(text: str) -> int | None:
-    m = re.search(r"(?is)(?:credit|cibil)\s*score.{0,30}?([3-9][0-9]{2})", text)
-    return int(m.group(1)) if m else None
+def _find_credit_score(text: str, positions: dict[str, list[int]]) -> int | None:
+    for pos in sorted(positions.get("credit", []) + positions.get("cibil", [])):
+        m = _CREDIT_SCORE_RE.match(text, pos)
+        if m:
+            return int(m.group(1))
+    return None
 
 
 def _extract_month_keys_from_named_months(text: str) -> set[str]:
-    pattern = r"(?i)\b(" + "|".join(MONTH_NAMES) + r")[a-z]*[\s\-/,]*(20[0-9]{2})?\b"
-    matches = re.findall(pattern, text)
+    matches = _NAMED_MONTH_RE.findall(text)
     keys: set[str] = set()
     for month_name, year in matches:
-        month_idx = MONTH_NAMES.index(month_name[:3].lower()) + 1
+        month_idx = _MONTH_NUM[month_name[:3].lower()]
         yr = year if year else "0000"
         keys.add(f"{yr}-{month_idx:02d}")
     return keys
 
 
 def _extract_month_keys_from_dates(text: str) -> set[str]:
-    # Matches dates like 12/01/2026, 12-1-26, 2026/01/12
-    dmy = re.findall(r"\b([0-3]?\d)[/\-]([0-1]?\d)[/\-]((?:20)?\d{2})\b", text)
-    ymd = re.findall(r"\b((?:20)?\d{2})[/\-]([0-1]?\d)[/\-]([0-3]?\d)\b", text)
-    keys: set[str] = set()
-    for _, month, year in dmy:
-        mm = int(month)
-        if 1 <= mm <= 12:
-            yy = int(year)
-            yy = 2000 + yy if yy < 100 else yy
-            keys.add(f"{yy:04d}-{mm:02d}")
-    for year, month, _ in ymd:
-        mm = int(month)
-        if 1 <= mm <= 12:
-            yy = int(year)
-            yy = 2000 + yy if yy < 100 else yy
-            keys.add(f"{yy:04d}-{mm:02d}")
+    # Statements repeat the same month on every transaction line, so dedupe the raw
+    # (month, year) captures first and only convert each distinct pair once.
+    pairs = {(month, year) for _, month, year in _DMY_RE.findall(text)}
+    pairs.update((month, year) for year, month, _ in _YMD_RE.findall(text))
+    keys = {_date_month_key(month, year) for month, year in pairs}
+    keys.discard(None)
     return keys
 
 
+def _date_month_key(month: str, year: str) -> str | None:
+    mm = int(month)
+    if not 1 <= mm <= 12:
+        return None
+    yy = int(year)
+    yy = 2000 + yy if yy < 100 else yy
+    return f"{yy:04d}-{mm:02d}"
+
+
 def _transaction_statement_months(text: str) -> set[str]:
     # Prefer transaction evidence: lines with date + amount patterns.
+    # A single finditer covers the whole text; matches are grouped by the line they start on.
+    # Within a line, dates win over month names, and a line needs a digit (an amount) to count.
     tx_months: set[str] = set()
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    amount_like = re.compile(r"(?i)(?:₹|rs\.?|inr)?\s*[0-9][0-9,]*(?:\.\d{1,2})?")
-    for line in lines:
-        has_amount = bool(amount_like.search(line))
-        if not has_amount:
-            continue
-        keys = _extract_month_keys_from_dates(line)
-        if keys:
-            tx_months.update(keys)
+    line_start = -1
+    date_keys: set[str] = set()
+    named_keys: set[str] = set()
+
+    def flush() -> None:
+        if date_keys:
+            tx_months.update(date_keys)
+        elif named_keys:
+            line_end = text.find("\n", line_start)
+            if _DIGIT_RE.search(text, line_start, line_end if line_end >= 0 else len(text)):
+                tx_months.update(named_keys)
+
+    for m in _TX_MONTH_RE.finditer(text):
+        start = text.rfind("\n", 0, m.start()) + 1
+        if start != line_start:
+            flush()
+            line_start = start
+            date_keys = set()
+            named_keys = set()
+        if m.group("dmy_month"):
+            key = _date_month_key(m.group("dmy_month"), m.group("dmy_year"))
+        elif m.group("ymd_month"):
+            key = _date_month_key(m.group("ymd_month"), m.group("ymd_year"))
+        else:
+            month_idx = _MONTH_NUM[m.group("month_name")[:3].lower()]
+            named_keys.add(f"{m.group('named_year') or '0000'}-{month_idx:02d}")
             continue
-        keys = _extract_month_keys_from_named_months(line)
-        if keys:
-            tx_months.update(keys)
+        if key:
+            date_keys.add(key)
+    flush()
     return tx_months
 
 
 def _summary_statement_months(text: str) -> set[str]:
     # Fallback: parse only labeled summary table section.
-    m = re.search(r"(?is)bank\s*statement\s*summary(.{0,2500})", text)
+    m = _SUMMARY_SECTION_RE.search(text)
     if not m:
         return set()
     section = m.group(1)
@@ -253,47 +453,30 @@ def _build_salary_breakdown(salary: float, confidence: float) -> list[SalaryRow]
 
 
 def _month_to_num(month_text: str) -> int:
-    short = month_text.strip()[:3].lower()
-    return MONTH_NAMES.index(short) + 1 if short in MONTH_NAMES else 0
+    return _MONTH_NUM.get(month_text.strip()[:3].lower(), 0)
 
 
-def _extract_salary_rows_from_labeled_tables(raw_text: str) -> list[SalaryRow]:
+def _extract_salary_rows_from_labeled_tables(lines: list[str], lowered: str) -> list[SalaryRow]:
     """
     Parse salary rows from sections labeled Salary Slip / Summary / Statement.
     Expected row shape: Month, Employer, Amount (delimiter-separated or spaced).
+    `lines` are the stripped non-empty lines of the text and `lowered` its lowercase form.
     """
-    lowered = raw_text.lower()
     if not any(label in lowered for label in SALARY_TABLE_LABELS):
         return []
 
-    lines = [ln.strip() for ln in raw_text.splitlines() if ln.strip()]
     rows: list[SalaryRow] = []
 
-    # Pattern for delimiter-based rows:
-    # Jan 2026 | Acme Corp | INR 55,000
-    delim_pattern = re.compile(
-        r"(?i)\b("
-        + "|".join(MONTH_NAMES)
-        + r")[a-z]*\s*(20\d{2})?\s*[\|,;\t]\s*([^|,;\t]{2,80})\s*[\|,;\t]\s*((?:₹|rs\.?|inr)?\s*[0-9][0-9,]*(?:\.\d+)?)"
-    )
-    # Pattern for whitespace-based rows:
-    # Jan 2026 Acme Corp INR 55,000
-    space_pattern = re.compile(
-        r"(?i)\b("
-        + "|".join(MONTH_NAMES)
-        + r")[a-z]*\s*(20\d{2})?\s+([A-Za-z][A-Za-z0-9&.,'()\- ]{2,80}?)\s+((?:₹|rs\.?|inr)?\s*[0-9][0-9,]*(?:\.\d+)?)\b"
-    )
-
     for line in lines:
-        match = delim_pattern.search(line) or space_pattern.search(line)
+        match = _SALARY_ROW_RE.search(line)
         if not match:
             continue
         month_txt = match.group(1)
-        year_txt = match.group(2) or str(datetime.utcnow().year)
-        employer = match.group(3).strip(" :-|")
-        amount_txt = match.group(4)
+        year_txt, employer, amount_txt = match.group(2, 3, 4) if match.group(3) is not None else match.group(5, 6, 7)
+        year_txt = year_txt or str(datetime.utcnow().year)
+        employer = employer.strip(" :-|")
         try:
-            amount = _to_amount(re.sub(r"(?i)(₹|rs\.?|inr)", "", amount_txt).strip())
+            amount = _to_amount(amount_txt)
         except Exception:
             continue
         month_num = _month_to_num(month_txt)
@@ -323,7 +506,11 @@ def extract_structured_data(documents: list[dict]) -> tuple[dict, list[SalaryRow
     ocr_flags: list[bool] = []
     ocr_conf_scores: list[float] = []
     for doc in documents:
-        text, info = _read_text_from_document(doc["filename"], doc["content"])
+        # Callers may pre-read text per file (see read_document_text); otherwise read it here.
+        if "text" in doc:
+            text, info = doc["text"], doc["text_info"]
+        else:
+            text, info = read_document_text(doc["filename"], doc["content"])
         doc_types.append(classify_document_type(doc["filename"], text))
         if text.strip():
             all_text.append(text)
@@ -331,9 +518,13 @@ def extract_structured_data(documents: list[dict]) -> tuple[dict, list[SalaryRow
         ocr_conf_scores.append(float(info["ocr_confidence"]))
 
     merged_text_raw = "\n".join(all_text)
+    # Lowercase and split the merged text once; every parser below works from these.
     merged_text = merged_text_raw.lower()
+    lines = [stripped for stripped in map(str.strip, merged_text_raw.splitlines()) if stripped]
+    text_length = len(merged_text.strip())
 
-    salary_rows = _extract_salary_rows_from_labeled_tables(merged_text_raw)
+    salary_rows = _extract_salary_rows_from_labeled_tables(lines, merged_text)
+    field_positions = _field_keyword_positions(merged_text)
     salary_source = "keyword"
     salary = None
     if salary_rows:
@@ -346,19 +537,10 @@ def extract_structured_data(documents: list[dict]) -> tuple[dict, list[SalaryRow
         salary_source = "structured_table"
 
     if salary is None:
-        salary = _find_amount_after_keywords(
-            merged_text,
-            ["monthly salary", "net salary", "net pay", "salary credited", "take home", "gross salary", "income"],
-        )
-    emi = _find_amount_after_keywords(
-        merged_text,
-        ["emi", "monthly installment", "loan emi", "total emi", "obligation"],
-    )
-    outstanding = _find_amount_after_keywords(
-        merged_text,
-        ["outstanding", "principal outstanding", "loan outstanding", "total due"],
-    )
-    credit_score = _find_credit_score(merged_text)
+        salary = _find_amount_after_keywords(merged_text, SALARY_KEYWORDS, field_positions)
+    emi = _find_amount_after_keywords(merged_text, EMI_KEYWORDS, field_positions)
+    outstanding = _find_amount_after_keywords(merged_text, OUTSTANDING_KEYWORDS, field_positions)
+    credit_score = _find_credit_score(merged_text, field_positions)
     bank_statement_months = _estimate_statement_months(merged_text, doc_types.count("bank_statement"))
 
     salary = salary if salary is not None else 0.0
@@ -371,7 +553,7 @@ def extract_structured_data(documents: list[dict]) -> tuple[dict, list[SalaryRow
     ocr_avg_conf = round(sum(ocr_conf_scores) / len(ocr_conf_scores), 2) if ocr_conf_scores else 0.0
     parsed_fields = sum(1 for v in (salary, emi, outstanding, credit_score) if v > 0)
     parse_conf = min(0.95, 0.5 + (0.1 * parsed_fields))
-    text_conf = 0.92 if merged_text.strip() else 0.0
+    text_conf = 0.92 if text_length else 0.0
     base_conf = ocr_avg_conf if ocr_used else text_conf
     final_conf = round((base_conf + parse_conf) / 2, 2)
 
@@ -424,7 +606,7 @@ def extract_structured_data(documents: list[dict]) -> tuple[dict, list[SalaryRow
     processing = {
         "ocr_used": ocr_used,
         "ocr_confidence": ocr_avg_conf,
-        "text_length": len(merged_text.strip()),
+        "text_length": text_length,
         "low_quality": ocr_used and (ocr_avg_conf < OCR_MIN_CONFIDENCE),
     }
     return extracted, salary_breakdown, obligations, processing
@@ -470,29 +652,41 @@ def detect_pending_forms(extracted_data: dict, missing_documents: list[str]) ->
     return pending
 
 
+@lru_cache(maxsize=1)
+def _historical_query_index() -> tuple[list, dict[str, list[int]]]:
+    """Historical query rows plus an inverted index of tag -> row positions, built once."""
+    rows = _load_json("historical_queries.json").get("queries", [])
+    index: dict[str, list[int]] = {}
+    for pos, row in enumerate(rows):
+        for tag in set(row.get("tags", [])):
+            index.setdefault(tag, []).append(pos)
+    return rows, index
+
+
 def predict_credit_queries(
     extracted_data: dict,
     missing_documents: list[str],
     pending_forms: list[PendingFormItem],
 ) -> list[PredictedQuery]:
-    rows = _load_json("historical_queries.json").get("queries", [])
-    tokens = set(re.findall(r"[a-z_]+", " ".join(missing_documents).lower()))
-    tokens.update(re.findall(r"[a-z_]+", " ".join(f.form_code for f in pending_forms).lower()))
+    rows, tag_index = _historical_query_index()
+    tokens = set(_TAG_TOKEN_RE.findall(" ".join(missing_documents).lower()))
+    tokens.update(_TAG_TOKEN_RE.findall(" ".join(f.form_code for f in pending_forms).lower()))
     if extracted_data.get("emi_ratio_percent", 0) > 40:
         tokens.add("high_emi")
     if extracted_data.get("credit_score", 0) < 700:
         tokens.add("low_credit")
 
+    # Only rows sharing at least one tag are visited; the count per row is its tag overlap.
+    overlaps: Counter[int] = Counter()
+    for token in tokens:
+        overlaps.update(tag_index.get(token, ()))
     scored: list[tuple[float, dict]] = []
-    for row in rows:
-        tag_set = set(row.get("tags", []))
-        overlap = len(tokens.intersection(tag_set))
-        score = min(0.99, row.get("base_confidence", 0.5) + (0.08 * overlap))
-        if overlap > 0:
-            scored.append((score, row))
-
-    scored.sort(key=lambda item: item[0], reverse=True)
-    top = scored[:3] if scored else [(0.62, rows[0])] if rows else []
+    for pos in sorted(overlaps):
+        row = rows[pos]
+        scored.append((min(0.99, row.get("base_confidence", 0.5) + (0.08 * overlaps[pos])), row))
+
+    # nlargest is stable like sorted(), so equal scores keep file order.
+    top = heapq.nlargest(3, scored, key=itemgetter(0)) if scored else [(0.62, rows[0])] if rows else []
     return [
         PredictedQuery(
             query=item[1]["query"],
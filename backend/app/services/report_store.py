@@ -1,31 +1,46 @@
 """SQLite-backed report store."""
 
-import json
 import sqlite3
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 from app.models.schemas import ObligationRow, PendingFormItem, PredictedQuery, RuleDecision, SalaryRow
 
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "reports.db"
 
 
+_conn_lock = threading.Lock()
+_connection: Optional[sqlite3.Connection] = None
+
+
 def _conn() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS reports (
-            report_id TEXT PRIMARY KEY,
-            created_at TEXT NOT NULL,
-            payload TEXT NOT NULL
+    """Shared connection, opened on first use (not at import) and reused for every call.
+
+    Callers must hold _conn_lock while using it.
+    """
+    global _connection
+    if _connection is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                report_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
         )
-        """
-    )
-    conn.commit()
-    return conn
+        _connection = conn
+    return _connection
 
 
 def generate_report_id() -> str:
@@ -59,18 +74,18 @@ def save_report(
         "confidence_summary": confidence_summary,
         "metadata": metadata,
     }
-    with _conn() as conn:
-        conn.execute(
+    data = orjson.dumps(payload)
+    with _conn_lock:
+        _conn().execute(
             "INSERT OR REPLACE INTO reports (report_id, created_at, payload) VALUES (?, ?, ?)",
-            (report_id, payload["created_at"], json.dumps(payload)),
+            (report_id, payload["created_at"], data),
         )
-        conn.commit()
 
 
 def get_report(report_id: str) -> Optional[dict]:
-    with _conn() as conn:
-        cur = conn.execute("SELECT payload FROM reports WHERE report_id = ?", (report_id,))
-        row = cur.fetchone()
+    with _conn_lock:
+        row = _conn().execute("SELECT payload FROM reports WHERE report_id = ?", (report_id,)).fetchone()
     if not row:
         return None
-    return json.loads(row[0])
+    # Rows written before the switch to orjson hold TEXT; orjson.loads accepts both str and bytes.
+    return orjson.loads(row[0])
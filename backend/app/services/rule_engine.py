@@ -1,71 +1,303 @@
 """Config-driven eligibility rule engine."""
 
-import json
+import asyncio
+import hashlib
+import logging
+import operator
+import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Optional
+
+import orjson
+from watchfiles import Change, DefaultFilter, awatch
 
 from app.models.schemas import RuleDecision
 
 RULES_PATH = Path(__file__).resolve().parents[1] / "data" / "eligibility_rules.json"
 
+logger = logging.getLogger(__name__)
+
+
+# Values of these types compare with numeric thresholds directly; anything else (Decimal, numeric strings)
+# is converted to float first.
+_NATIVE_NUMBERS = frozenset({int, float, bool})
+
+
+# operator -> (comparison, symbol shown when the rule passes, symbol shown when it fails)
+_OPS: dict[str, tuple[Callable[[Any, Any], bool], str, str]] = {
+    ">=": (operator.ge, ">=", "<"),
+    "<=": (operator.le, "<=", ">"),
+    ">": (operator.gt, ">", "<="),
+    "<": (operator.lt, "<", ">="),
+    "==": (operator.eq, "==", "!="),
+}
+_UNSUPPORTED_OP = (None, "", "")
+
+
+class _MissingMetric:
+    """Stands in for an absent/None metric; every comparison raises TypeError, so no per-rule None check."""
+
+    __slots__ = ()
+
+    def _not_comparable(self, other: Any) -> bool:
+        raise TypeError("metric missing")
+
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = _not_comparable
+    __hash__ = object.__hash__
+
+
+_MISSING = _MissingMetric()
+
+
+def _as_number(value: Any) -> Any:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+@dataclass(slots=True)
+class _CompiledRule:
+    """
+    A rule with its operator resolved and message pieces prebuilt.
+    Messages read "<metric>=<value> <symbol> <threshold>"; op_fn is None for an unsupported operator.
+    """
+
+    rule_id: str
+    rule_name: str
+    metric: str
+    op: str
+    threshold: Any
+    numeric_threshold: bool
+    op_fn: Optional[Callable[[Any, Any], bool]]
+    message_prefix: str
+    suffix_if_passed: str
+    suffix_if_failed: str
+
+
+# Compiled rules plus the distinct metrics they read, so each metric is looked up once per evaluation.
+_CompiledRuleSet = tuple[list[_CompiledRule], tuple[str, ...]]
+
+
+def _compile_rule(rule: dict) -> _CompiledRule:
+    """Resolve a rule's operator to a comparison function once, instead of on every evaluation."""
+    op = rule["operator"]
+    op_fn, sym_pass, sym_fail = _OPS.get(op, _UNSUPPORTED_OP)
+    metric, threshold = rule["metric"], rule["value"]
+    # Numeric thresholds written as strings ("30000") are converted once here rather than per evaluation.
+    if isinstance(threshold, str):
+        threshold = _as_number(threshold)
+    return _CompiledRule(
+        rule_id=rule["id"],
+        rule_name=rule["name"],
+        metric=metric,
+        op=op,
+        threshold=threshold,
+        numeric_threshold=type(threshold) in _NATIVE_NUMBERS,
+        op_fn=op_fn,
+        message_prefix=f"{metric}=",
+        suffix_if_passed=f" {sym_pass} {threshold}",
+        suffix_if_failed=f" {sym_fail} {threshold}",
+    )
+
+
+@dataclass(slots=True)
+class _Decision:
+    """Lightweight per-rule result used inside the evaluation loop; converted to RuleDecision on return."""
+
+    rule_id: str
+    rule_name: str
+    passed: bool
+    message: str
+    details: Optional[dict]
+
+
+def _to_rule_decisions(decisions: list[_Decision]) -> list[RuleDecision]:
+    # Fields come from our own compiled rules, so skip pydantic validation.
+    return [
+        RuleDecision.model_construct(
+            rule_id=d.rule_id, rule_name=d.rule_name, passed=d.passed, message=d.message, details=d.details
+        )
+        for d in decisions
+    ]
+
+
+def _compile_rules(data: bytes) -> _CompiledRuleSet:
+    payload = orjson.loads(data)
+    rules = [_compile_rule(rule) for rule in payload.get("rules", [])]
+    return rules, tuple(dict.fromkeys(rule.metric for rule in rules))
+
 
-def _load_rules() -> list[dict]:
-    with RULES_PATH.open("r", encoding="utf-8") as f:
-        payload = json.load(f)
-    return payload.get("rules", [])
+class _RulesHolder:
+    """Compiled rules plus the file identity and content digest they were built from; unset until first load."""
 
+    __slots__ = ("rules", "file_key", "digest")
 
-def evaluate_eligibility(extracted_data: dict) -> tuple[bool, list[RuleDecision]]:
+
+_HOLDER = _RulesHolder()
+_load_lock = threading.Lock()
+
+
+def _refresh_rules_locked() -> bool:
+    """Recompile the rules if the file's content changed; caller holds _load_lock. Returns True on recompile."""
+    stat = os.stat(RULES_PATH)
+    # Cheap check first; st_ino catches atomic replaces that keep mtime and size.
+    file_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    if getattr(_HOLDER, "file_key", None) == file_key:
+        return False
+    data = RULES_PATH.read_bytes()
+    digest = hashlib.blake2b(data, digest_size=32).digest()
+    if getattr(_HOLDER, "digest", None) != digest:
+        # Touched-but-identical files (a redeploy of the same config) skip the parse.
+        _HOLDER.rules = _compile_rules(data)
+        _HOLDER.digest = digest
+        changed = True
+    else:
+        changed = False
+    _HOLDER.file_key = file_key
+    return changed
+
+
+def _get_compiled_rules() -> _CompiledRuleSet:
+    # Hot path is a single attribute read: no stat, no lock once the rules are loaded.
+    try:
+        return _HOLDER.rules
+    except AttributeError:
+        with _load_lock:
+            if not hasattr(_HOLDER, "rules"):
+                _refresh_rules_locked()
+            return _HOLDER.rules
+
+
+def rules_version() -> bytes:
+    """Content digest of the rules currently in use; changes whenever a reload recompiles them."""
+    _get_compiled_rules()
+    return _HOLDER.digest
+
+
+def reload_rules() -> bool:
+    """
+    Pick up edits to eligibility_rules.json; evaluations otherwise keep using the loaded rules.
+    Returns True when the rules were recompiled, False when the file content is unchanged.
+    """
+    with _load_lock:
+        return _refresh_rules_locked()
+
+
+def warm_rule_cache() -> None:
+    """Load and compile the rules ahead of the first evaluation (called at app startup)."""
+    _get_compiled_rules()
+
+
+class _RulesFileFilter(DefaultFilter):
+    """Pass only changes to the rules file; the SQLite store shares the data directory and writes often."""
+
+    ignore_entity_patterns = (*DefaultFilter.ignore_entity_patterns, r"^reports\.db")
+
+    def __call__(self, change: Change, path: str) -> bool:
+        return super().__call__(change, path) and Path(path).name == RULES_PATH.name
+
+
+async def watch_rules(stop_event: asyncio.Event) -> None:
+    """Reload the rules whenever eligibility_rules.json changes on disk, until stop_event is set."""
+    # Watch the directory, not the file: editors and deploys often replace the file by rename.
+    try:
+        async for _ in awatch(
+            RULES_PATH.parent,
+            watch_filter=_RulesFileFilter(),
+            stop_event=stop_event,
+            recursive=False,
+        ):
+            try:
+                await asyncio.to_thread(reload_rules)
+            except Exception:
+                # A half-written or invalid file keeps the previous rules in place until the next change.
+                logger.exception("Failed to reload %s", RULES_PATH)
+    except Exception:
+        # The app keeps serving with the loaded rules; only hot reload is lost.
+        logger.exception("Rules file watcher stopped; hot reload disabled")
+
+
+def _apply_rule(rule: _CompiledRule, value: Any) -> tuple[bool, str, Any]:
+    """Check one metric value against a compiled rule; returns (passed, message, value as compared)."""
+    op_fn = rule.op_fn
+    # Present values take the straight path; a missing metric (_MISSING) or an unsupported
+    # operator (op_fn None) surfaces as TypeError and is sorted out here.
+    try:
+        if rule.numeric_threshold and type(value) not in _NATIVE_NUMBERS:
+            value = _as_number(value)
+        passed = op_fn(value, rule.threshold)
+    except TypeError:
+        if value is _MISSING:
+            return False, f"Metric {rule.metric} missing in extracted data", None
+        if op_fn is None:
+            return False, f"Unsupported operator: {rule.op}", value
+        raise
+    suffix = rule.suffix_if_passed if passed else rule.suffix_if_failed
+    return passed, rule.message_prefix + str(value) + suffix, value
+
+
+def _rule_details(rule: _CompiledRule, value: Any) -> dict:
+    return {"metric": rule.metric, "operator": rule.op, "threshold": rule.threshold, "value": value}
+
+
+def evaluate_eligibility(
+    extracted_data: dict, *, thorough: bool = True, include_details: bool = True
+) -> tuple[bool, list[RuleDecision]]:
     """
     Evaluate eligibility using externally editable JSON rules.
     Supported operators: >=, <=, >, <, ==.
+    With thorough=False evaluation stops at the first failing rule, for callers that only need the verdict;
+    decisions then cover the rules evaluated so far.
+    With include_details=False decisions carry details=None instead of the metric/operator/threshold/value dict.
     """
-    decisions: list[RuleDecision] = []
-    rules = _load_rules()
-    all_passed = True
+    rules, metrics = _get_compiled_rules()
+    get = extracted_data.get
+    resolved = {metric: _MISSING if (value := get(metric)) is None else value for metric in metrics}
+    decisions: list[_Decision] = []
 
     for rule in rules:
-        metric = rule["metric"]
-        operator = rule["operator"]
-        threshold = rule["value"]
-        value = extracted_data.get(metric)
-        passed = False
-
-        if value is None:
-            passed = False
-            message = f"Metric {metric} missing in extracted data"
-        elif operator == ">=":
-            passed = value >= threshold
-            message = f"{metric}={value} {'>=' if passed else '<'} {threshold}"
-        elif operator == "<=":
-            passed = value <= threshold
-            message = f"{metric}={value} {'<=' if passed else '>'} {threshold}"
-        elif operator == ">":
-            passed = value > threshold
-            message = f"{metric}={value} {'>' if passed else '<='} {threshold}"
-        elif operator == "<":
-            passed = value < threshold
-            message = f"{metric}={value} {'<' if passed else '>='} {threshold}"
-        elif operator == "==":
-            passed = value == threshold
-            message = f"{metric}={value} {'==' if passed else '!='} {threshold}"
-        else:
-            passed = False
-            message = f"Unsupported operator: {operator}"
-
+        passed, message, value = _apply_rule(rule, resolved[rule.metric])
         decisions.append(
-            RuleDecision(
-                rule_id=rule["id"],
-                rule_name=rule["name"],
-                passed=passed,
-                message=message,
-                details={
-                    "metric": metric,
-                    "operator": operator,
-                    "threshold": threshold,
-                    "value": value,
-                },
+            _Decision(
+                rule.rule_id,
+                rule.rule_name,
+                passed,
+                message,
+                _rule_details(rule, value) if include_details else None,
             )
         )
-        all_passed = all_passed and passed
+        if not passed and not thorough:
+            return False, _to_rule_decisions(decisions)
+
+    return all(decision.passed for decision in decisions), _to_rule_decisions(decisions)
+
 
-    return all_passed, decisions
+def evaluate_eligibility_batch(
+    rows: list[dict], *, include_details: bool = True
+) -> list[tuple[bool, list[RuleDecision]]]:
+    """
+    Evaluate several applicants in one call; results match evaluate_eligibility per row.
+    Rules are applied rule by rule across all rows, so per-rule lookups happen once per batch.
+    """
+    rules, _ = _get_compiled_rules()
+    row_decisions: list[list[_Decision]] = [[] for _ in rows]
+    for rule in rules:
+        metric = rule.metric
+        for row, decisions in zip(rows, row_decisions):
+            value = row.get(metric)
+            passed, message, value = _apply_rule(rule, _MISSING if value is None else value)
+            decisions.append(
+                _Decision(
+                    rule.rule_id,
+                    rule.rule_name,
+                    passed,
+                    message,
+                    _rule_details(rule, value) if include_details else None,
+                )
+            )
+    return [
+        (all(decision.passed for decision in decisions), _to_rule_decisions(decisions)) for decisions in row_decisions
+    ]